@@ -13,6 +13,7 @@ import warnings
 import dotenv
 import workflows.server
 
+import ppe.workflows.incident_status_work_flow
 import ppe.workflows.ppe_work_flow
 
 warnings.filterwarnings("ignore")
@@ -23,17 +24,30 @@ dotenv.load_dotenv()
 server = workflows.server.WorkflowServer()
 ppe_work_flow = ppe.workflows.ppe_work_flow.get_work_flow()
 server.add_workflow(name=ppe_work_flow.name, workflow=ppe_work_flow)
+incident_status_work_flow = ppe.workflows.incident_status_work_flow.get_work_flow(
+    ppe_work_flow.outbox
+)
+server.add_workflow(
+    name=incident_status_work_flow.name,
+    workflow=incident_status_work_flow
+)
 
 
 async def main() -> None:
     """Start the workflow server.
 
     Reads host and port from environment variables and starts the server
-    to handle PPE workflow requests.
+    to handle PPE workflow requests. The incident outbox workers run for
+    the lifetime of the server, so incidents queued before a restart are
+    delivered without waiting for a new violation.
     """
     host = os.environ.get("WORKFLOWS_PY_SERVER_HOST")
     port = int(os.environ.get("WORKFLOWS_PY_SERVER_PORT"))
-    await server.serve(host=host, port=port)
+    ppe_work_flow.start_outbox_dispatcher()
+    try:
+        await server.serve(host=host, port=port)
+    finally:
+        await ppe_work_flow.stop_outbox_dispatcher()
 
 
 if __name__ == "__main__":
@@ -14,11 +14,12 @@ from dotenv import load_dotenv
 from llama_index.core import Settings
 from llama_index.core.memory import VectorMemoryBlock
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.llms.ollama import Ollama
 from llama_index.vector_stores.postgres import PGVectorStore
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine
 
+from ppe.llm.metered_ollama import MeteredOllama
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -30,10 +31,11 @@ PG_HOST = os.environ.get("PG_HOST")
 PG_PORT = os.environ.get("PG_PORT")
 PG_LONG_TERM_DB = os.environ.get("PG_LONG_TERM_DB")
 
-llm = Ollama(
+llm = MeteredOllama(
     model=os.environ.get("LLAMA_MODEL"),
     request_timeout=360.0,
     context_window=8000,
+    keep_alive=os.environ.get("LLAMA_KEEP_ALIVE", "30m"),
 )
 Settings.llm = llm
 
@@ -0,0 +1,76 @@
+"""Metered Ollama LLM used by the PPE agents.
+
+This module provides an Ollama subclass that records the prompt and
+completion statistics Ollama reports for each chat call, so the effect of
+prompt-prefix reuse can be observed.
+"""
+
+import logging
+from typing import Any, Dict, Sequence
+
+from llama_index.core.base.llms.types import ChatMessage, ChatResponse
+from llama_index.llms.ollama import Ollama
+from pydantic import PrivateAttr
+
+logger = logging.getLogger()
+
+
+class MeteredOllama(Ollama):
+    """Ollama LLM that records per-call token and timing statistics.
+
+    Responses are not cached: every agent request carries its own
+    incident_key and detections, and a replayed tool call would record the
+    wrong incident. Prompt-prefix reuse is left to Ollama, which reuses the
+    KV cache of the longest common prompt prefix while the model stays
+    loaded (see ``keep_alive``). The agent's system prompt and tool specs
+    are built once and form that stable prefix, so reuse shows up here as
+    fewer prompt tokens evaluated and a shorter prompt evaluation time.
+    """
+
+    _calls: int = PrivateAttr(default=0)
+    _prompt_tokens: int = PrivateAttr(default=0)
+    _completion_tokens: int = PrivateAttr(default=0)
+    _prompt_eval_ns: int = PrivateAttr(default=0)
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Get the class name used for serialization."""
+        return "MeteredOllama_llm"
+
+    async def achat(
+        self,
+        messages: Sequence[ChatMessage],
+        **kwargs: Any
+    ) -> ChatResponse:
+        """Chat with the model and record Ollama's usage statistics.
+
+        Args:
+            messages: Chat messages to send.
+            **kwargs: Additional arguments, including ``tools`` specs.
+
+        Returns:
+            Chat response from the model.
+        """
+        response = await super().achat(messages, **kwargs)
+        raw = response.raw if isinstance(response.raw, dict) else {}
+        self._calls += 1
+        self._prompt_tokens += int(raw.get("prompt_eval_count") or 0)
+        self._completion_tokens += int(raw.get("eval_count") or 0)
+        self._prompt_eval_ns += int(raw.get("prompt_eval_duration") or 0)
+        return response
+
+    def usage_metrics(self) -> Dict[str, Any]:
+        """Report token usage and prompt evaluation time.
+
+        Returns:
+            Calls, prompt and completion tokens evaluated, and the average
+            prompt tokens and prompt evaluation seconds per call.
+        """
+        calls = self._calls or 1
+        return {
+            "calls": self._calls,
+            "prompt_tokens": self._prompt_tokens,
+            "completion_tokens": self._completion_tokens,
+            "avg_prompt_tokens": self._prompt_tokens / calls,
+            "avg_prompt_eval_seconds": self._prompt_eval_ns / calls / 1e9,
+        }
@@ -0,0 +1,415 @@
+"""Durable incident outbox for asynchronous incident creation.
+
+This module provides a SQLite-backed outbox that records PPE violations
+and acknowledges them immediately, and a pool of background workers that
+drain the outbox to the MCP incident recorder with retry and backoff.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import aiosqlite
+import dotenv
+
+logger = logging.getLogger()
+
+dotenv.load_dotenv()
+
+OUTBOX_DB_PATH = os.environ.get("OUTBOX_DB_PATH", "incident_outbox.db")
+OUTBOX_WORKERS = int(os.environ.get("OUTBOX_WORKERS", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BASE_BACKOFF_SECONDS = float(
+    os.environ.get("OUTBOX_BASE_BACKOFF_SECONDS", "2")
+)
+OUTBOX_MAX_BACKOFF_SECONDS = float(
+    os.environ.get("OUTBOX_MAX_BACKOFF_SECONDS", "300")
+)
+OUTBOX_POLL_INTERVAL_SECONDS = float(
+    os.environ.get("OUTBOX_POLL_INTERVAL_SECONDS", "1")
+)
+OUTBOX_METRICS_INTERVAL_SECONDS = float(
+    os.environ.get("OUTBOX_METRICS_INTERVAL_SECONDS", "60")
+)
+# Seconds a workflow run waits for its incident; 0 acknowledges right away
+OUTBOX_AWAIT_SECONDS = float(os.environ.get("OUTBOX_AWAIT_SECONDS", "0"))
+
+PENDING = "PENDING"
+IN_FLIGHT = "IN_FLIGHT"
+DELIVERED = "DELIVERED"
+FAILED = "FAILED"
+
+
+class IncidentOutbox:
+    """SQLite-backed queue of incidents waiting to be recorded.
+
+    Entries are keyed by an idempotency key, so enqueueing the same
+    violation twice records a single incident. The key is also handed to
+    the deliver coroutine so the incident recorder can deduplicate retries.
+
+    Attributes:
+        db_path: Path of the SQLite database file.
+    """
+
+    def __init__(self, db_path: str = OUTBOX_DB_PATH) -> None:
+        """Initialize the outbox.
+
+        Args:
+            db_path: Path of the SQLite database file.
+        """
+        self.db_path = db_path
+        self._db: aiosqlite.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open the database and create the outbox table on first use.
+
+        Entries left in flight by a previous process are returned to the
+        pending state so they are retried.
+
+        Returns:
+            Open aiosqlite connection.
+        """
+        if self._db is None:
+            db = await aiosqlite.connect(self.db_path)
+            db.row_factory = aiosqlite.Row
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS incident_outbox (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    delivered_at REAL,
+                    incident_id TEXT,
+                    last_error TEXT
+                )
+                """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS incident_outbox_due "
+                "ON incident_outbox (state, next_attempt_at)"
+            )
+            await db.execute(
+                "UPDATE incident_outbox SET state = ? WHERE state = ?",
+                (PENDING, IN_FLIGHT)
+            )
+            await db.commit()
+            self._db = db
+        return self._db
+
+    async def enqueue(self, key: str, payload: Dict[str, Any]) -> bool:
+        """Durably record an incident to be created.
+
+        Args:
+            key: Idempotency key identifying the violation.
+            payload: JSON-serializable incident data.
+
+        Returns:
+            True if the entry was added, False if the key already existed.
+        """
+        async with self._lock:
+            db = await self._connect()
+            now = time.time()
+            cursor = await db.execute(
+                """
+                INSERT OR IGNORE INTO incident_outbox
+                    (key, payload, state, created_at, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, json.dumps(payload), PENDING, now, now)
+            )
+            await db.commit()
+            return cursor.rowcount > 0
+
+    async def claim(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """Claim due entries for delivery.
+
+        Args:
+            limit: Maximum number of entries to claim.
+
+        Returns:
+            Claimed entries with key, payload and attempts.
+        """
+        async with self._lock:
+            db = await self._connect()
+            async with db.execute(
+                """
+                SELECT key, payload, attempts FROM incident_outbox
+                WHERE state = ? AND next_attempt_at <= ?
+                ORDER BY next_attempt_at LIMIT ?
+                """,
+                (PENDING, time.time(), limit)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            await db.executemany(
+                "UPDATE incident_outbox SET state = ? WHERE key = ?",
+                [(IN_FLIGHT, row['key']) for row in rows]
+            )
+            await db.commit()
+            return [
+                {
+                    "key": row['key'],
+                    "payload": json.loads(row['payload']),
+                    "attempts": row['attempts'],
+                }
+                for row in rows
+            ]
+
+    async def mark_delivered(self, key: str, incident_id: str) -> None:
+        """Mark an entry as delivered.
+
+        Args:
+            key: Idempotency key of the entry.
+            incident_id: Incident identifier returned by the recorder.
+        """
+        async with self._lock:
+            db = await self._connect()
+            await db.execute(
+                """
+                UPDATE incident_outbox
+                SET state = ?, delivered_at = ?, incident_id = ?,
+                    attempts = attempts + 1, last_error = NULL
+                WHERE key = ?
+                """,
+                (DELIVERED, time.time(), incident_id, key)
+            )
+            await db.commit()
+
+    async def mark_retry(self, key: str, attempts: int, error: str) -> bool:
+        """Schedule a failed entry for retry with exponential backoff.
+
+        Args:
+            key: Idempotency key of the entry.
+            attempts: Number of attempts made so far, including this one.
+            error: Description of the delivery failure.
+
+        Returns:
+            True if the entry will be retried, False if it has exhausted
+            OUTBOX_MAX_ATTEMPTS and was marked as failed.
+        """
+        retry = attempts < OUTBOX_MAX_ATTEMPTS
+        backoff = min(
+            OUTBOX_BASE_BACKOFF_SECONDS * (2 ** (attempts - 1)),
+            OUTBOX_MAX_BACKOFF_SECONDS
+        )
+        async with self._lock:
+            db = await self._connect()
+            await db.execute(
+                """
+                UPDATE incident_outbox
+                SET state = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+                WHERE key = ?
+                """,
+                (
+                    PENDING if retry else FAILED,
+                    attempts,
+                    time.time() + backoff,
+                    error,
+                    key
+                )
+            )
+            await db.commit()
+        return retry
+
+    async def get(self, key: str) -> Dict[str, Any] | None:
+        """Look up the delivery status of an entry.
+
+        Args:
+            key: Idempotency key of the entry.
+
+        Returns:
+            Entry state, attempts, incident_id and last_error, or None if
+            the key is unknown.
+        """
+        async with self._lock:
+            db = await self._connect()
+            async with db.execute(
+                """
+                SELECT state, attempts, incident_id, last_error
+                FROM incident_outbox WHERE key = ?
+                """,
+                (key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return dict(row) if row is not None else None
+
+    async def wait(self, key: str, timeout: float) -> Dict[str, Any] | None:
+        """Wait until an entry is delivered or has failed for good.
+
+        Args:
+            key: Idempotency key of the entry.
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            Entry as returned by get once it is DELIVERED or FAILED, or its
+            current state when the timeout expires.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = await self.get(key)
+            if entry is None or entry['state'] in (DELIVERED, FAILED):
+                return entry
+            if time.monotonic() >= deadline:
+                return entry
+            await asyncio.sleep(OUTBOX_POLL_INTERVAL_SECONDS)
+
+    async def close(self) -> None:
+        """Close the database connection if it is open."""
+        async with self._lock:
+            if self._db is not None:
+                await self._db.close()
+                self._db = None
+
+    async def metrics(self) -> Dict[str, Any]:
+        """Report queue depth and lag.
+
+        Returns:
+            Entry counts per state and lag_seconds, the age of the oldest
+            entry that has not been delivered yet.
+        """
+        async with self._lock:
+            db = await self._connect()
+            async with db.execute(
+                "SELECT state, COUNT(*) FROM incident_outbox GROUP BY state"
+            ) as cursor:
+                counts = {row[0]: row[1] for row in await cursor.fetchall()}
+            async with db.execute(
+                "SELECT MIN(created_at) FROM incident_outbox "
+                "WHERE state IN (?, ?)",
+                (PENDING, IN_FLIGHT)
+            ) as cursor:
+                oldest = (await cursor.fetchone())[0]
+        return {
+            "pending": counts.get(PENDING, 0),
+            "in_flight": counts.get(IN_FLIGHT, 0),
+            "delivered": counts.get(DELIVERED, 0),
+            "failed": counts.get(FAILED, 0),
+            "lag_seconds": time.time() - oldest if oldest is not None else 0.0,
+        }
+
+
+class OutboxDispatcher:
+    """Pool of background workers draining the incident outbox.
+
+    Attributes:
+        outbox: Outbox to drain.
+        deliver: Coroutine creating the incident for an idempotency key
+            and payload and returning its incident identifier.
+        workers: Number of concurrent workers.
+    """
+
+    def __init__(
+        self,
+        outbox: IncidentOutbox,
+        deliver: Callable[[str, Dict[str, Any]], Awaitable[str]],
+        workers: int = OUTBOX_WORKERS
+    ) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+            outbox: Outbox to drain.
+            deliver: Coroutine creating the incident for a key and payload.
+            workers: Number of concurrent workers.
+        """
+        self.outbox = outbox
+        self.deliver = deliver
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._wake_up = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the workers and the metrics reporter if not running."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(worker_id))
+            for worker_id in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._report_metrics()))
+
+    async def stop(self) -> None:
+        """Cancel the workers and wait for them to exit."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a new entry was enqueued."""
+        self._wake_up.set()
+
+    async def _work(self, worker_id: int) -> None:
+        """Claim and deliver outbox entries until cancelled.
+
+        Errors are logged and never end the loop, so a worker only exits
+        when it is cancelled.
+
+        Args:
+            worker_id: Index of the worker, used for logging.
+        """
+        while True:
+            try:
+                entries = await self.outbox.claim()
+                if not entries:
+                    self._wake_up.clear()
+                    try:
+                        await asyncio.wait_for(
+                            self._wake_up.wait(),
+                            timeout=OUTBOX_POLL_INTERVAL_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                for entry in entries:
+                    await self._deliver(worker_id, entry)
+            except Exception as ex:
+                logger.error("Outbox worker %s failed: %s", worker_id, ex)
+                await asyncio.sleep(OUTBOX_POLL_INTERVAL_SECONDS)
+
+    async def _deliver(self, worker_id: int, entry: Dict[str, Any]) -> None:
+        """Deliver a single entry and record the outcome.
+
+        If the outcome cannot be recorded the entry is scheduled for retry;
+        the recorder deduplicates by key, so redelivery is safe.
+
+        Args:
+            worker_id: Index of the worker, used for logging.
+            entry: Claimed outbox entry.
+        """
+        key = entry['key']
+        attempts = entry['attempts'] + 1
+        try:
+            incident_id = await self.deliver(key, entry['payload'])
+            await self.outbox.mark_delivered(key, incident_id)
+            logger.info(
+                "Outbox worker %s delivered %s as %s", worker_id, key, incident_id
+            )
+        except Exception as ex:
+            try:
+                retry = await self.outbox.mark_retry(key, attempts, repr(ex))
+            except Exception as mark_ex:
+                logger.error(
+                    "Outbox worker %s failed to reschedule %s: %s",
+                    worker_id, key, mark_ex
+                )
+                return
+            logger.error(
+                "Outbox worker %s failed to deliver %s (attempt %s, retry=%s): %s",
+                worker_id, key, attempts, retry, ex
+            )
+
+    async def _report_metrics(self) -> None:
+        """Periodically log outbox queue metrics until cancelled."""
+        while True:
+            await asyncio.sleep(OUTBOX_METRICS_INTERVAL_SECONDS)
+            try:
+                logger.info("Incident outbox metrics %s", await self.outbox.metrics())
+            except Exception as ex:
+                logger.error("Unable to collect outbox metrics: %s", ex)
@@ -16,6 +16,8 @@ def get_image_analyser_agent(llm: LLM, tools: List[BaseTool]) -> FunctionAgent:
 
     This agent is configured as a Senior Manager capable of analyzing images
     for PPE violations and creating incidents when violations are found.
+    Streaming is disabled so LLM calls go through ``achat``, where the
+    configured LLM records its usage statistics.
 
     Args:
         llm: Language model instance to use for the agent.
@@ -28,6 +30,7 @@ def get_image_analyser_agent(llm: LLM, tools: List[BaseTool]) -> FunctionAgent:
         name='image_analyser',
         llm=llm,
         tools=tools,
+        streaming=False,
         system_prompt=(
             "You are a Senior Manager who can analyse image for PPE violations "
             "and can create incident if any violations found. You should use "
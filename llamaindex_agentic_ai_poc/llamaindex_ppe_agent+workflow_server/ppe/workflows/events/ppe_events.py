@@ -1,9 +1,12 @@
 """PPE workflow event definitions.
 
 This module defines all event types used in the PPE workflow system,
-including start events, intermediate events, and stop events.
+including start events, intermediate events, stream events, and stop
+events.
 """
 
+from typing import Any, Dict
+
 import pydantic
 from pydantic import Field
 from workflows.events import StartEvent, Event, StopEvent
@@ -40,6 +43,61 @@ class ViolationsFoundEvent(Event):
     msg: str = Field(..., description="Message describing an image analyzed")
 
 
+class DetectionsEvent(Event):
+    """Stream event carrying the raw YOLO detections for an image.
+
+    Attributes:
+        site_id: Identifier for the site where the image was captured.
+        detections: Serialized Detections (see Detections.to_payload).
+    """
+    site_id: str = Field(..., description="Site ID")
+    detections: Dict[str, Any] = Field(..., description="Detections payload")
+
+
+class VerdictEvent(Event):
+    """Stream event carrying the PPE violation verdict for an image.
+
+    Published as soon as detection finishes so clients can act on the
+    verdict before incident creation completes.
+
+    Attributes:
+        site_id: Identifier for the site where the image was captured.
+        violations: True if violations were found, False if every person
+            wears the required PPE, None if no person was detected.
+    """
+    site_id: str = Field(..., description="Site ID")
+    violations: bool | None = Field(..., description="Violation verdict")
+
+
+class IncidentStatusRequestEvent(StartEvent):
+    """Event requesting the delivery status of a queued incident.
+
+    Attributes:
+        incident_key: Outbox key returned when the incident was queued.
+    """
+    incident_key: str = Field(alias='incident_key')
+
+
+class IncidentQueuedEvent(Event):
+    """Event indicating that an incident was written to the outbox.
+
+    Attributes:
+        incident_key: Outbox key identifying the queued incident.
+    """
+    incident_key: str = Field(..., description="Outbox key of the incident")
+
+
+class IncidentPendingEvent(Event):
+    """Stream event indicating that incident creation has started.
+
+    Attributes:
+        msg: Message describing the pending incident.
+        incident_key: Outbox key of the pending incident.
+    """
+    msg: str = Field(..., description="Incident creation is pending.")
+    incident_key: str = Field(..., description="Outbox key of the incident")
+
+
 class IncidentCreatedEvent(Event):
     """Event indicating that an incident was successfully created.
 
@@ -0,0 +1,59 @@
+"""Incident status workflow implementation.
+
+This module defines a workflow that reports the delivery status of an
+incident queued in the outbox by the PPE workflow.
+"""
+
+from workflows import Workflow, step
+from workflows.events import StopEvent
+
+from ppe.outbox.incident_outbox import IncidentOutbox
+from ppe.workflows.events.ppe_events import IncidentStatusRequestEvent
+
+
+class IncidentStatusWorkFlow(Workflow):
+    """Workflow resolving an outbox key to its incident status.
+
+    Attributes:
+        name: Workflow identifier name.
+        outbox: Outbox shared with the PPE workflow.
+    """
+
+    def __init__(self, outbox: IncidentOutbox, **kwargs) -> None:
+        """Initialize the incident status workflow.
+
+        Args:
+            outbox: Outbox shared with the PPE workflow.
+            **kwargs: Additional arguments passed to parent Workflow class.
+        """
+        super().__init__(**kwargs)
+        self.name = "incident_status_work_flow"
+        self.outbox = outbox
+
+    @step
+    async def get_status(self, ev: IncidentStatusRequestEvent) -> StopEvent:
+        """Look up the outbox entry for an incident key.
+
+        Args:
+            ev: Event carrying the outbox key of the incident.
+
+        Returns:
+            StopEvent with the incident_key, state, attempts, incident_id
+            and last_error, or state UNKNOWN if the key is not queued.
+        """
+        entry = await self.outbox.get(ev.incident_key)
+        if entry is None:
+            entry = {"state": "UNKNOWN"}
+        return StopEvent(result={"incident_key": ev.incident_key, **entry})
+
+
+def get_work_flow(outbox: IncidentOutbox) -> IncidentStatusWorkFlow:
+    """Create and return a configured incident status workflow instance.
+
+    Args:
+        outbox: Outbox shared with the PPE workflow.
+
+    Returns:
+        IncidentStatusWorkFlow instance reading from the given outbox.
+    """
+    return IncidentStatusWorkFlow(outbox)
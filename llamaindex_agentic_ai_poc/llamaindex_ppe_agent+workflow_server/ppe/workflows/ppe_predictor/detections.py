@@ -0,0 +1,186 @@
+"""Compact detection results shared across the PPE pipeline.
+
+This module provides a columnar container for YOLO detections backed by
+a single NumPy structured array, so detections travel from inference to
+verdict to incident payload without per-detection Python objects.
+"""
+
+import base64
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+DETECTION_DTYPE = np.dtype([
+    ('class_id', '<i2'),
+    ('confidence', '<f4'),
+    ('box', '<f4', (4,)),
+])
+# Bumped whenever the payload layout produced by to_payload changes
+PAYLOAD_VERSION = 1
+
+
+class Detections:
+    """Detections for one image stored as a NumPy structured array.
+
+    Class ids index into ``names``, the class-name table of the model, so
+    each class name is stored once regardless of the number of detections.
+
+    Attributes:
+        records: Structured array with class_id, confidence and xyxy box.
+        names: Class names indexed by class id.
+    """
+
+    __slots__ = ('records', 'names')
+
+    def __init__(self, records: np.ndarray, names: Tuple[str, ...]) -> None:
+        """Initialize detections.
+
+        Args:
+            records: Structured array with DETECTION_DTYPE.
+            names: Class names indexed by class id.
+        """
+        self.records = records
+        self.names = names
+
+    @classmethod
+    def from_arrays(
+        cls,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray,
+        names: Tuple[str, ...]
+    ) -> "Detections":
+        """Build detections from parallel box, confidence and class arrays.
+
+        Args:
+            boxes: N x 4 array of xyxy boxes in frame pixels.
+            confidences: Array of N confidences.
+            class_ids: Array of N class ids.
+            names: Class names indexed by class id.
+
+        Returns:
+            Detections holding the given arrays.
+        """
+        records = np.empty(len(class_ids), dtype=DETECTION_DTYPE)
+        records['class_id'] = class_ids
+        records['confidence'] = confidences
+        records['box'] = np.asarray(boxes).reshape(-1, 4)
+        return cls(records, names)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Detections":
+        """Rebuild detections from to_payload output.
+
+        The record layout is read from the payload's dtype description,
+        so payloads remain readable if DETECTION_DTYPE changes. The records
+        are viewed in place with np.frombuffer rather than copied.
+
+        Args:
+            payload: Dictionary produced by to_payload.
+
+        Returns:
+            Detections described by the payload.
+
+        Raises:
+            ValueError: If the payload version is not supported.
+        """
+        if payload.get('version') != PAYLOAD_VERSION:
+            raise ValueError(
+                f"Unsupported detections payload version {payload.get('version')}"
+            )
+        dtype = np.dtype([tuple(field) for field in payload['dtype']])
+        records = np.frombuffer(base64.b64decode(payload['records']), dtype=dtype)
+        return cls(records, tuple(payload['names']))
+
+    def __len__(self) -> int:
+        """Get the number of detections."""
+        return len(self.records)
+
+    @property
+    def class_ids(self) -> np.ndarray:
+        """Class id of each detection."""
+        return self.records['class_id']
+
+    @property
+    def confidences(self) -> np.ndarray:
+        """Confidence of each detection."""
+        return self.records['confidence']
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """N x 4 xyxy box of each detection."""
+        return self.records['box']
+
+    def class_id(self, name: str) -> int:
+        """Look up the class id of a class name.
+
+        Args:
+            name: Class name.
+
+        Returns:
+            Class id, or -1 if the model has no such class.
+        """
+        return self.names.index(name) if name in self.names else -1
+
+    def contains_all(self, names: Sequence[str]) -> bool:
+        """Check whether every given class was detected at least once.
+
+        Args:
+            names: Class names to look for.
+
+        Returns:
+            True if each class is present among the detections.
+        """
+        wanted = np.array([self.class_id(name) for name in names])
+        return bool(np.isin(wanted, self.class_ids).all())
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize detections per class.
+
+        Returns:
+            Dictionary with the total count and, per detected class name,
+            the number of detections and their highest confidence.
+        """
+        class_ids, inverse, counts = np.unique(
+            self.class_ids, return_inverse=True, return_counts=True
+        )
+        max_confidences = np.zeros(len(class_ids), dtype=np.float32)
+        np.maximum.at(max_confidences, inverse, self.confidences)
+        return {
+            "count": len(self),
+            "classes": {
+                self.names[class_id]: {
+                    "count": count,
+                    "max_confidence": round(confidence, 3),
+                }
+                for class_id, count, confidence in zip(
+                    class_ids.tolist(), counts.tolist(), max_confidences.tolist()
+                )
+            },
+        }
+
+    def to_bytes(self) -> bytes:
+        """Serialize the records to raw little-endian bytes.
+
+        Returns:
+            Raw records, 22 bytes per detection.
+        """
+        return self.records.tobytes()
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Serialize detections to a JSON-compatible dictionary.
+
+        Returns:
+            Dictionary with the payload version, the record dtype as
+            ``numpy.dtype.descr``, the class-name table, the detection
+            count and the base64-encoded raw records. Clients decode the
+            records with ``np.frombuffer(records, np.dtype([tuple(field)
+            for field in dtype]))``.
+        """
+        return {
+            "version": PAYLOAD_VERSION,
+            "dtype": DETECTION_DTYPE.descr,
+            "names": list(self.names),
+            "count": len(self),
+            "records": base64.b64encode(self.to_bytes()).decode('ascii'),
+        }
@@ -1,24 +1,49 @@
 """PPE prediction tools using YOLO model.
 
 This module provides tools for analyzing images to detect PPE violations
-using a YOLO (You Only Look Once) object detection model.
+using a YOLO (You Only Look Once) object detection model. Sites listed in
+PPE_ROI_SITES use region-of-interest inference: a low-resolution pass
+finds persons and only the person crops are run at high resolution.
 """
 
+import asyncio
 import base64
 import logging
+import os
 import traceback
-from collections import Counter
 from io import BytesIO
 from typing import List
 
 import cv2
+import dotenv
 import numpy as np
+import torch
+import torchvision.ops
 from PIL import Image
 from ultralytics import YOLO
 import ultralytics.engine.results
 
+from ppe.workflows.ppe_predictor.detections import Detections
+
+dotenv.load_dotenv()
+
 yolo_model: YOLO = YOLO('ppe/workflows/ppe_predictor/model/best.pt')
 
+# Class-name table shared by every Detections instance, indexed by class id
+CLASS_NAMES = tuple(yolo_model.names[i] for i in range(len(yolo_model.names)))
+REQUIRED_PPE = ('helmet', 'gloves', 'vest', 'boots')
+
+# Comma separated site ids using ROI inference, "*" enables it for every site
+PPE_ROI_SITES = {
+    site.strip()
+    for site in os.environ.get("PPE_ROI_SITES", "").split(",")
+    if site.strip()
+}
+PPE_ROI_DETECT_IMGSZ = int(os.environ.get("PPE_ROI_DETECT_IMGSZ", "320"))
+PPE_ROI_PPE_IMGSZ = int(os.environ.get("PPE_ROI_PPE_IMGSZ", "640"))
+PPE_ROI_PADDING = float(os.environ.get("PPE_ROI_PADDING", "0.15"))
+PPE_ROI_NMS_IOU = float(os.environ.get("PPE_ROI_NMS_IOU", "0.5"))
+
 
 async def ppe_risk_analyser(
     user_id: str,
@@ -45,19 +70,8 @@ async def ppe_risk_analyser(
     """
     print('ppe_risk_analyser working')
     try:
-        detected_objects = await predict_model(image)
-        if detected_objects and len(detected_objects) > 0:
-            classes_counts = set(Counter(detected_objects[0]))
-            if 'Person' in classes_counts:
-                return (
-                    'helmet' not in classes_counts or
-                    'gloves' not in classes_counts or
-                    'vest' not in classes_counts or
-                    'boots' not in classes_counts
-                )
-            else:
-                return None
-        return None
+        detected_objects = await predict_model(image, site_id)
+        return evaluate_ppe_violations(detected_objects)
 
     except Exception as ex:
         logging.error(ex)
@@ -67,32 +81,151 @@ async def ppe_risk_analyser(
         )
 
 
-async def predict_model(image: str) -> List[List[str]]:
+def evaluate_ppe_violations(detections: Detections) -> bool | None:
+    """Decide whether detected objects amount to a PPE violation.
+
+    Args:
+        detections: Detections as returned by predict_model.
+
+    Returns:
+        True if a person is detected without the required PPE items,
+        False if the required PPE items are present,
+        None if no person is detected.
+    """
+    if not detections.contains_all(('Person',)):
+        return None
+    return not detections.contains_all(REQUIRED_PPE)
+
+
+async def predict_model(
+    image: str,
+    site_id: str | None = None
+) -> Detections:
     """Predict objects in an image using YOLO model.
 
-    Decodes a base64-encoded image and runs YOLO object detection to
-    identify objects present in the image.
+    Runs predict_detections in a worker thread so decoding, inference and
+    NMS do not block the event loop shared with the outbox workers.
 
     Args:
         image: Base64-encoded image data.
+        site_id: Identifier for the site where the image was captured.
+
+    Returns:
+        Detections with class ids, confidences and boxes for the image.
+    """
+    return await asyncio.to_thread(predict_detections, image, site_id)
+
+
+def predict_detections(image: str, site_id: str | None = None) -> Detections:
+    """Decode an image and run YOLO object detection on it.
+
+    Sites configured for ROI mode are analysed with predict_roi instead of
+    a single full-frame pass.
+
+    Args:
+        image: Base64-encoded image data.
+        site_id: Identifier for the site where the image was captured.
 
     Returns:
-        List of lists containing detected object class names. Each inner
-        list represents detections from one image (currently single image).
+        Detections with class ids, confidences and boxes for the image.
     """
     img_bytes = base64.b64decode(image)
     img_np = np.frombuffer(img_bytes, np.uint8)
     img_cv2 = cv2.imdecode(img_np, cv2.IMREAD_COLOR)
+    if is_roi_site(site_id):
+        return predict_roi(img_cv2)
+
     yolo_responses: List[ultralytics.engine.results.Results] = (
         yolo_model.predict(img_cv2)
     )
 
-    detected_objects = []
     if yolo_responses and len(yolo_responses) > 0:
         yolo_response = yolo_responses[0]
         if yolo_response.boxes is not None:
-            detected_objects.append([
-                yolo_model.names[int(c)]
-                for c in yolo_response.boxes.cls
-            ])
-    return detected_objects
+            return Detections.from_arrays(
+                yolo_response.boxes.xyxy.cpu().numpy(),
+                yolo_response.boxes.conf.cpu().numpy(),
+                yolo_response.boxes.cls.cpu().numpy(),
+                CLASS_NAMES
+            )
+    return Detections.from_arrays(
+        np.empty((0, 4)), np.empty(0), np.empty(0), CLASS_NAMES
+    )
+
+
+def is_roi_site(site_id: str | None) -> bool:
+    """Check whether a site is configured for ROI inference.
+
+    Args:
+        site_id: Identifier for the site where the image was captured.
+
+    Returns:
+        True if the site is listed in PPE_ROI_SITES or "*" is listed.
+    """
+    return '*' in PPE_ROI_SITES or site_id in PPE_ROI_SITES
+
+
+def predict_roi(img: np.ndarray) -> Detections:
+    """Run region-of-interest inference on a decoded image.
+
+    A low-resolution pass over the full frame finds Person boxes. The
+    padded person regions are cropped and run as one high-resolution batch
+    so small PPE items are detected. Crop detections are shifted back to
+    frame coordinates and merged with the full-frame detections using
+    class-aware NMS.
+
+    Args:
+        img: Decoded BGR image.
+
+    Returns:
+        Detections in frame pixel coordinates after NMS.
+    """
+    coarse = yolo_model.predict(img, imgsz=PPE_ROI_DETECT_IMGSZ, verbose=False)[0]
+    boxes = coarse.boxes.xyxy.cpu().numpy()
+    confidences = coarse.boxes.conf.cpu().numpy()
+    classes = coarse.boxes.cls.cpu().numpy()
+
+    persons = boxes[classes == CLASS_NAMES.index('Person')]
+    if len(persons) == 0:
+        return Detections.from_arrays(boxes, confidences, classes, CLASS_NAMES)
+
+    height, width = img.shape[:2]
+    padding = (persons[:, 2:] - persons[:, :2]) * PPE_ROI_PADDING
+    regions = np.concatenate(
+        [persons[:, :2] - padding, persons[:, 2:] + padding], axis=1
+    )
+    regions = np.clip(regions, 0, [width, height, width, height]).astype(int)
+    regions = regions[
+        (regions[:, 2] > regions[:, 0]) & (regions[:, 3] > regions[:, 1])
+    ]
+    if len(regions) == 0:
+        return Detections.from_arrays(boxes, confidences, classes, CLASS_NAMES)
+    crops = [img[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+
+    fine_results = yolo_model.predict(
+        crops, imgsz=PPE_ROI_PPE_IMGSZ, verbose=False
+    )
+    counts = [len(result.boxes) for result in fine_results]
+    if sum(counts) == 0:
+        return Detections.from_arrays(boxes, confidences, classes, CLASS_NAMES)
+    offsets = np.repeat(regions[:, [0, 1, 0, 1]], counts, axis=0)
+    boxes = np.concatenate(
+        [boxes] + [r.boxes.xyxy.cpu().numpy() for r in fine_results]
+    )
+    boxes[len(boxes) - len(offsets):] += offsets
+    confidences = np.concatenate(
+        [confidences] + [r.boxes.conf.cpu().numpy() for r in fine_results]
+    )
+    classes = np.concatenate(
+        [classes] + [r.boxes.cls.cpu().numpy() for r in fine_results]
+    )
+
+    keep = torchvision.ops.batched_nms(
+        torch.from_numpy(boxes).float(),
+        torch.from_numpy(confidences).float(),
+        torch.from_numpy(classes).long(),
+        PPE_ROI_NMS_IOU
+    ).numpy()
+    return Detections.from_arrays(
+        boxes[keep], confidences[keep], classes[keep], CLASS_NAMES
+    )
@@ -2,10 +2,15 @@
 
 This module defines the main workflow for processing PPE compliance
 analysis, including image analysis, violation detection, and incident
-creation.
+creation. Intermediate results (detections, verdict, incident progress)
+are published to the workflow event stream as soon as they are known.
+Incidents are recorded through a durable outbox drained in the background.
 """
 
+import hashlib
+import json
 import logging
+from typing import Any, Dict
 
 import dotenv
 import llama_index.core
@@ -16,17 +21,28 @@ from workflows import Workflow, Context, step
 from workflows.events import StopEvent
 
 import ppe.mcp_client.mcp_client
+import ppe.outbox.incident_outbox
 import ppe.workflows.agents.ppe_agents
 import ppe.workflows.ppe_predictor.ppe_tools
+from ppe.workflows.ppe_predictor.detections import Detections
 from ppe.config.config import ContextProvider
+from ppe.llm.metered_ollama import MeteredOllama
 from ppe.workflows.events.ppe_events import (
+    DetectionsEvent,
     ImageUploadedEvent,
+    IncidentCreatedEvent,
+    IncidentPendingEvent,
+    IncidentQueuedEvent,
     ViolationsFoundEvent,
-    NoViolationsFoundEvent
+    NoViolationsFoundEvent,
+    VerdictEvent
 )
 
 dotenv.load_dotenv()
 
+# Name under which the MCP server exposes the incident recorder tool
+INCIDENT_RECORDER_TOOL = "Incident Recorder"
+
 
 class PPEWorkFlow(Workflow):
     """Workflow for processing PPE compliance analysis.
@@ -34,14 +50,25 @@ class PPEWorkFlow(Workflow):
     This workflow handles the complete lifecycle of PPE compliance checking:
     1. Receives image upload events
     2. Analyzes images for PPE violations
-    3. Creates incidents when violations are detected
+    3. Queues incidents in the outbox when violations are detected
     4. Manages memory and context throughout the process
 
+    Detections, the violation verdict and incident progress are written
+    to the event stream so clients can act before the StopEvent arrives.
+    Incidents are created by the outbox workers using the agent, so a slow
+    or unavailable LLM or MCP server does not block the request. The run
+    stops as soon as the incident is queued and its status is available
+    from the incident status workflow. Setting OUTBOX_AWAIT_SECONDS opts
+    into waiting that long for the incident and streaming
+    IncidentCreatedEvent once it is recorded.
+
     Attributes:
         name: Workflow identifier name.
         llm: Language model instance for agent operations.
         context_provider: Provider for memory and context management.
         agent: Function agent for image analysis and incident creation.
+        outbox: Durable queue of incidents waiting to be created.
+        outbox_dispatcher: Background workers draining the outbox.
     """
 
     def __init__(self, context_provider: ContextProvider, **kwargs) -> None:
@@ -56,6 +83,8 @@ class PPEWorkFlow(Workflow):
         self.llm = llama_index.core.Settings.llm
         self.context_provider = context_provider
         self.agent: llama_index.core.agent.FunctionAgent = None
+        self.outbox = ppe.outbox.incident_outbox.IncidentOutbox()
+        self.outbox_dispatcher: ppe.outbox.incident_outbox.OutboxDispatcher = None
 
     @step
     async def analyse_image(
@@ -65,8 +94,9 @@ class PPEWorkFlow(Workflow):
     ) -> NoViolationsFoundEvent | ViolationsFoundEvent:
         """Analyze uploaded image for PPE violations.
 
-        This step processes an uploaded image, stores the request in state,
-        loads memory for the session, and checks for PPE violations.
+        This step processes an uploaded image, stores the request in state
+        and checks for PPE violations. The detections and the verdict are
+        streamed as soon as they are known.
 
         Args:
             ctx: Workflow context for state management and event sending.
@@ -85,17 +115,23 @@ class PPEWorkFlow(Workflow):
             }
             state['ppe_request'] = ppe_request
             state['session_key'] = self.get_session_key(ppe_request)
-            await self.set_up(llm=llama_index.core.Settings.llm)
 
-        memory: Memory = await self.context_provider.get_memory(
-            key=state['session_key']
+        detections = await ppe.workflows.ppe_predictor.ppe_tools.predict_model(
+            ev.image,
+            ev.site_id
         )
-
-        violations = await ppe.workflows.ppe_predictor.ppe_tools.ppe_risk_analyser(
-            ev.user_id,
-            ev.site_id,
-            ev.image
+        detections_payload = detections.to_payload()
+        ctx.write_event_to_stream(
+            DetectionsEvent(site_id=ev.site_id, detections=detections_payload)
         )
+        violations = ppe.workflows.ppe_predictor.ppe_tools.evaluate_ppe_violations(
+            detections
+        )
+        ctx.write_event_to_stream(
+            VerdictEvent(site_id=ev.site_id, violations=violations)
+        )
+        async with ctx.store.edit_state() as state:
+            state['ppe_request']['detections'] = detections_payload
 
         if violations is True:
             ctx.send_event(
@@ -111,40 +147,183 @@ class PPEWorkFlow(Workflow):
         self,
         ctx: Context,
         ev: NoViolationsFoundEvent | ViolationsFoundEvent
-    ) -> StopEvent:
+    ) -> StopEvent | IncidentQueuedEvent:
         """Handle PPE violation events.
 
         If no violations are found, stops the workflow. If violations are
-        found, creates an incident using the agent and returns the result.
+        found, queues the incident in the outbox, streams
+        IncidentPendingEvent and stops with the incident PENDING; the
+        outbox workers create the incident in the background.
 
         Args:
             ctx: Workflow context for state management.
             ev: Event indicating whether violations were found or not.
 
         Returns:
-            StopEvent with the workflow result, including incident details
-            if violations were found.
+            StopEvent with the workflow result, including the outbox key of
+            the pending incident if violations were found, or
+            IncidentQueuedEvent if OUTBOX_AWAIT_SECONDS opts into waiting.
         """
         if isinstance(ev, NoViolationsFoundEvent):
             return StopEvent(result="No issues found")
         else:
+            ppe_request = await ctx.store.get('ppe_request')
+            session_key = await ctx.store.get('session_key')
+            incident_key = self.get_incident_key(session_key)
+            await self.outbox.enqueue(
+                incident_key,
+                {
+                    "user_id": ppe_request['user_id'],
+                    "site_id": ppe_request['site_id'],
+                    "session_key": session_key,
+                    "detections": ppe_request['detections']
+                }
+            )
+            self.start_outbox_dispatcher()
             async with ctx.store.edit_state() as state:
-                memory: Memory = await self.context_provider.get_memory(
-                    key=state['session_key']
+                state['ppe_request']['incident_key'] = incident_key
+                state['ppe_request']['incident_state'] = (
+                    ppe.outbox.incident_outbox.PENDING
+                )
+                ppe_request = dict(state['ppe_request'])
+            ctx.write_event_to_stream(
+                IncidentPendingEvent(
+                    msg=f"Creating incident for site {ppe_request['site_id']}",
+                    incident_key=incident_key
                 )
-                ppe_request = state['ppe_request']
-                response = await self.agent.run(
-                    user_msg=(
-                        f"""create incident {{"kwargs": {{"user_id": """
-                        f"""{ppe_request['user_id']}, "site_id": """
-                        f""""{ppe_request['site_id']}" }} and finally """
-                        f"""return incident_id as response"""
-                    ),
-                    memory=memory
+            )
+            logging.info(f"Incident queued {incident_key}")
+            if ppe.outbox.incident_outbox.OUTBOX_AWAIT_SECONDS > 0:
+                return IncidentQueuedEvent(incident_key=incident_key)
+            return StopEvent(result=ppe_request)
+
+    @step
+    async def await_incident(
+        self,
+        ctx: Context,
+        ev: IncidentQueuedEvent
+    ) -> StopEvent:
+        """Wait for a queued incident and report its outcome.
+
+        Only used when OUTBOX_AWAIT_SECONDS is above 0. Streams
+        IncidentCreatedEvent if the outbox delivers the incident within
+        OUTBOX_AWAIT_SECONDS. Otherwise the run stops with the
+        incident still pending; its status can be looked up later with
+        the incident status workflow.
+
+        Args:
+            ctx: Workflow context for state management.
+            ev: Event carrying the outbox key of the queued incident.
+
+        Returns:
+            StopEvent with the workflow result, including the incident
+            state and, once delivered, the incident identifier.
+        """
+        entry = await self.outbox.wait(
+            ev.incident_key,
+            ppe.outbox.incident_outbox.OUTBOX_AWAIT_SECONDS
+        )
+        async with ctx.store.edit_state() as state:
+            state['ppe_request']['incident_state'] = entry['state']
+            if entry['state'] == ppe.outbox.incident_outbox.DELIVERED:
+                state['ppe_request']['incident'] = entry['incident_id']
+                ctx.write_event_to_stream(
+                    IncidentCreatedEvent(msg=entry['incident_id'])
                 )
-                state['ppe_request']['incident'] = response.response.content
-                logging.info(f"Incident Created {response}")
-                return StopEvent(result=state['ppe_request'])
+            return StopEvent(result=state['ppe_request'])
+
+    async def create_incident(
+        self,
+        incident_key: str,
+        payload: Dict[str, Any]
+    ) -> str:
+        """Create an incident for an outbox entry using the agent.
+
+        The outbox key is passed to the incident recorder, which returns
+        the existing incident instead of creating a duplicate on retry.
+        A per-class summary of the detections is attached to the incident.
+        The incident id is taken from a successful incident recorder call;
+        the agent reports tool failures as error outputs rather than
+        raising, so their absence is turned into an error here.
+
+        Args:
+            incident_key: Outbox idempotency key of the entry.
+            payload: Outbox payload with user_id, site_id, session_key and
+                detections.
+
+        Returns:
+            Incident identifier returned by the incident recorder.
+
+        Raises:
+            RuntimeError: If the agent did not call the incident recorder or
+                every call to it failed, so the outbox retries the entry.
+        """
+        await self.set_up(llm=llama_index.core.Settings.llm)
+        memory: Memory = await self.context_provider.get_memory(
+            key=payload['session_key']
+        )
+        detections = Detections.from_payload(payload['detections'])
+        response = await self.agent.run(
+            user_msg=(
+                f"""create incident {{"kwargs": {{"user_id": """
+                f"""{payload['user_id']}, "site_id": """
+                f""""{payload['site_id']}", "incident_key": """
+                f""""{incident_key}", "detections": """
+                f"""{json.dumps(detections.summary())} }} and finally """
+                f"""return incident_id as response"""
+            ),
+            memory=memory
+        )
+        if isinstance(self.llm, MeteredOllama):
+            logging.info(f"LLM usage metrics {self.llm.usage_metrics()}")
+        recorder_calls = [
+            tool_call for tool_call in response.tool_calls
+            if tool_call.tool_name == INCIDENT_RECORDER_TOOL
+        ]
+        for tool_call in reversed(recorder_calls):
+            if not tool_call.tool_output.is_error:
+                logging.info(f"Incident Created {tool_call.tool_output.content}")
+                return tool_call.tool_output.content
+        if recorder_calls:
+            raise RuntimeError(
+                f"Incident recorder failed for {incident_key}: "
+                f"{recorder_calls[-1].tool_output.content}"
+            )
+        raise RuntimeError(
+            f"Agent did not call the incident recorder for {incident_key}"
+        )
+
+    def start_outbox_dispatcher(self) -> None:
+        """Start the outbox workers if they are not running yet.
+
+        Called when the server starts, so entries left over from a previous
+        process are delivered without waiting for a new violation.
+        """
+        if self.outbox_dispatcher is None:
+            self.outbox_dispatcher = ppe.outbox.incident_outbox.OutboxDispatcher(
+                outbox=self.outbox,
+                deliver=self.create_incident
+            )
+            self.outbox_dispatcher.start()
+        self.outbox_dispatcher.notify()
+
+    async def stop_outbox_dispatcher(self) -> None:
+        """Stop the outbox workers and close the outbox database."""
+        if self.outbox_dispatcher is not None:
+            await self.outbox_dispatcher.stop()
+            self.outbox_dispatcher = None
+        await self.outbox.close()
+
+    def get_incident_key(self, session_key: str) -> str:
+        """Generate the outbox idempotency key for a session.
+
+        Args:
+            session_key: Session key of the PPE request.
+
+        Returns:
+            Hex SHA-256 digest of the session key.
+        """
+        return hashlib.sha256(session_key.encode()).hexdigest()
 
     def get_session_key(self, ev: dict) -> str:
         """Generate a unique session key from PPE request data.
@@ -20,6 +20,8 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)-15s %(message)s")
 
 # Global list to store incidents (in production, this should be a database)
 incidents = list()
+# Incident ids by idempotency key, so retried requests return the same incident
+incidents_by_key = dict()
 
 
 class PpeIncidents(BaseModel):
@@ -33,11 +35,15 @@ class PpeIncidents(BaseModel):
         site_id: Identifier for the site where the incident occurred.
         incident_id: Unique identifier for the incident, or None if not yet created.
         state: Current state of the incident (e.g., "OPEN", "CLOSED").
+        incident_key: Idempotency key supplied by the caller, if any.
+        detections: Per-class detection summary for the violation, if any.
     """
     user_id: str = Field(..., description="User ID")
     site_id: str = Field(..., description="Site ID")
     incident_id: str | None = Field(..., description="Incident ID")
     state: str = Field(..., description="Incident State")
+    incident_key: str | None = Field(None, description="Idempotency Key")
+    detections: dict | None = Field(None, description="Detection Summary")
 
 
 class RiskAssesmentToolSpec(BaseToolSpec):
@@ -65,7 +71,9 @@ class RiskAssesmentToolSpec(BaseToolSpec):
         "incident_recorder": ToolMetadata(
             name="Incident Recorder",
             description=(
-                "Create incident for user_id and site_id and return PpeIncidents"
+                "Create incident for user_id and site_id and return PpeIncidents. "
+                "Pass incident_key and detections unchanged; calls with the "
+                "same incident_key return the existing incident_id"
             ),
             return_direct=True
         )
@@ -76,13 +84,17 @@ class RiskAssesmentToolSpec(BaseToolSpec):
 
         Processes keyword arguments to extract user_id and site_id,
         creates a new incident with a unique UUID, and stores it in
-        the incidents list. In production, this should interact with
-        a proper database or API.
+        the incidents list. If an incident_key is given and an incident was
+        already recorded for it, the existing incident_id is returned
+        instead. In production, this should interact with a proper
+        database or API.
 
         Args:
             *args: Variable positional arguments (not used).
-            **kwargs: Keyword arguments containing user_id and site_id.
-                Expected format: {"kwargs": {"user_id": str, "site_id": str}}
+            **kwargs: Keyword arguments containing user_id, site_id and the
+                optional incident_key and detections. Expected format:
+                {"kwargs": {"user_id": str, "site_id": str,
+                "incident_key": str, "detections": dict}}
 
         Returns:
             String representation of the generated incident UUID.
@@ -93,6 +105,8 @@ class RiskAssesmentToolSpec(BaseToolSpec):
         try:
             global user_id
             global site_id
+            incident_key = None
+            detections = None
             logger.info(f"{kwargs}")
 
             # Extract user_id and site_id from kwargs
@@ -101,19 +115,28 @@ class RiskAssesmentToolSpec(BaseToolSpec):
                     logger.info(type(value))
                     site_id = str(value['site_id'])
                     user_id = str(value['user_id'])
+                    incident_key = value.get('incident_key')
+                    detections = value.get('detections')
 
             logger.info(
                 f'incident_recorder being called with {user_id} {site_id}'
             )
+            if incident_key is not None and incident_key in incidents_by_key:
+                logger.info(f'incident already recorded for {incident_key}')
+                return incidents_by_key[incident_key]
             # Call an existing API to create an incident based on violations found
             incident_id = str(uuid4())
             incident = PpeIncidents(
                 user_id=user_id,
                 site_id=site_id,
                 state="OPEN",
-                incident_id=incident_id
+                incident_id=incident_id,
+                incident_key=incident_key,
+                detections=detections
             )
             incidents.append(incident)
+            if incident_key is not None:
+                incidents_by_key[incident_key] = incident_id
             logger.info(f'incident_id = {incident_id}')
             return str(incident_id)
 